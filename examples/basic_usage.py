@@ -5,7 +5,7 @@ import asyncio
 import asyncpg
 from datetime import datetime
 
-from k3l.fcgraph.embeds import migrate_up, sync_embeds_async
+from k3l.fcgraph.embeds import install_uvloop, migrate_up, sync_embeds_async
 from k3l.fcgraph.embeds.types import Embeds
 
 
@@ -63,39 +63,43 @@ async def example_sync():
     # Note: This example assumes you have source data available
     # In a real scenario, you'd connect to your Neynar/Farcaster database
 
-    print("1. Connecting to databases:")
+    print("1. Creating connection pools:")
     try:
-        # In production, these would be different databases
-        source_conn = await asyncpg.connect("postgresql:///")
-        target_conn = await asyncpg.connect("postgresql:///")
-
-        print("   ✓ Connected to source and target databases")
-
-        print("\n2. Running incremental sync:")
-
-        # Sync data from the last hour
-        min_timestamp = datetime.now().replace(minute=0, second=0, microsecond=0)
-
-        # This would typically sync from neynarv2.casts to public.k3l_cast_embeds
-        # For this example, we'll just show the API call
-        print(f"   Would sync data updated since: {min_timestamp}")
-        print("   (Skipping actual sync in example)")
-
-        # Uncomment this for actual sync:
-        # result = await sync_embeds_async(
-        #     source_conn=source_conn,
-        #     target_conn=target_conn,
-        #     min_updated_at=min_timestamp,
-        #     source_schema="neynarv2",
-        #     target_schema="public"
-        # )
-        # print(f"   ✓ Processed {result.casts_processed} casts")
-        # print(f"   ✓ Extracted {result.embeds_extracted} embeds")
-        # print(f"   ✓ Inserted {result.embeds_inserted} normalized embeds")
-
-        await source_conn.close()
-        await target_conn.close()
-        print("   ✓ Connections closed\n")
+        # In production, these would be different databases. Pools pay the
+        # connection handshake once and are closed on leaving the block.
+        async with asyncpg.create_pool(
+            "postgresql:///", min_size=2, max_size=4
+        ) as source_pool:
+            async with asyncpg.create_pool(
+                "postgresql:///", min_size=2, max_size=4
+            ) as target_pool:
+                print("   ✓ Connected to source and target databases")
+
+                print("\n2. Running incremental sync:")
+
+                # Sync data from the last hour
+                min_timestamp = datetime.now().replace(
+                    minute=0, second=0, microsecond=0
+                )
+
+                # This would typically sync from neynarv2.casts to public.k3l_cast_embeds
+                # For this example, we'll just show the API call
+                print(f"   Would sync data updated since: {min_timestamp}")
+                print("   (Skipping actual sync in example)")
+
+                # Uncomment this for actual sync:
+                # result = await sync_embeds_async(
+                #     source_conn=source_pool,
+                #     target_conn=target_pool,
+                #     min_updated_at=min_timestamp,
+                #     source_schema="neynarv2",
+                #     target_schema="public"
+                # )
+                # print(f"   ✓ Processed {result.casts_processed} casts")
+                # print(f"   ✓ Extracted {result.embeds_extracted} embeds")
+                # print(f"   ✓ Inserted {result.embeds_inserted} normalized embeds")
+
+        print("   ✓ Pools closed\n")
 
     except Exception as e:
         print(f"   ✗ Sync example failed: {e}\n")
@@ -114,4 +118,6 @@ async def main():
 
 
 if __name__ == "__main__":
+    # Use uvloop when available (pip install "k3l-fcgraph-embeds[fast]")
+    install_uvloop()
     asyncio.run(main())
@@ -32,13 +32,38 @@ Quick Start:
     >>> result = await sync_embeds_async(source_conn, target_conn, min_timestamp)
     >>> print(f"Processed {result.casts_processed} casts")
 
+Warning:
+    Each new asyncpg connection pays for a TCP (and TLS) handshake and
+    authentication. For anything but one-off scripts, pass pools from
+    ``get_pool()`` or ``asyncpg.create_pool()`` to ``sync_embeds_async``
+    instead of connections so that connection setup is paid once rather than
+    on every sync run.
+
 For detailed usage examples, see the README.md file.
 """
 
 __version__ = "0.1.0"
 
-from .migration_manager import MigrationManager, create_migration_manager
-from .sync import EmbedSyncResult, sync_embeds, sync_embeds_async
+from .sync import (
+    EmbedSyncResult,
+    close_pools,
+    get_pool,
+    install_uvloop,
+    sync_embeds,
+    sync_embeds_async,
+)
+
+# Alembic and SQLAlchemy are only needed for migrations, so importing them is
+# deferred until first use; sync-only processes never pay for it
+_MIGRATION_MANAGER_NAMES = ("MigrationManager", "create_migration_manager")
+
+
+def __getattr__(name: str):
+    if name in _MIGRATION_MANAGER_NAMES:
+        from . import migration_manager
+
+        return getattr(migration_manager, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # Public API for migration management
@@ -56,6 +81,8 @@ def migrate_up(
         version_table: Table name for migration versions (default: "k3l_embeds_alembic")
         revision: Target revision (default: "head" for latest)
     """
+    from .migration_manager import create_migration_manager
+
     manager = create_migration_manager(connection_string, schema, version_table)
     manager.upgrade(revision)
 
@@ -74,6 +101,8 @@ def migrate_down(
         schema: Database schema to use (default: "public")
         version_table: Table name for migration versions (default: "k3l_embeds_alembic")
     """
+    from .migration_manager import create_migration_manager
+
     manager = create_migration_manager(connection_string, schema, version_table)
     manager.downgrade(revision)
 
@@ -93,6 +122,8 @@ def get_migration_status(
     Returns:
         Dictionary with migration status information
     """
+    from .migration_manager import create_migration_manager
+
     manager = create_migration_manager(connection_string, schema, version_table)
 
     return {
@@ -111,4 +142,7 @@ __all__ = [
     "sync_embeds",
     "sync_embeds_async",
     "EmbedSyncResult",
+    "get_pool",
+    "close_pools",
+    "install_uvloop",
 ]
@@ -1,6 +1,9 @@
 """Migration management for k3l.fcgraph.embeds using programmatic Alembic."""
 
+import atexit
 import importlib.resources
+from contextlib import ExitStack
+from functools import cached_property
 from pathlib import Path
 from typing import Optional
 
@@ -10,6 +13,21 @@ from alembic.runtime.migration import MigrationContext
 from alembic.script import ScriptDirectory
 from sqlalchemy import create_engine, text
 from sqlalchemy.engine import Engine
+from sqlalchemy.pool import NullPool
+
+# Resolve the migrations directory to a real path once per process. For zipped
+# installs, as_file() extracts it (and the copy is removed at exit) only on
+# Python 3.12+, which added directory support; older Pythons need the package
+# installed as regular files
+_resources = ExitStack()
+atexit.register(_resources.close)
+_MIGRATIONS_PATH = str(
+    _resources.enter_context(
+        importlib.resources.as_file(
+            importlib.resources.files("k3l.fcgraph.embeds.migrations")
+        )
+    )
+)
 
 
 class MigrationManager:
@@ -31,18 +49,16 @@ class MigrationManager:
         self.connection_string = connection_string
         self.schema = schema
         self.version_table = version_table
-        self.engine = create_engine(connection_string)
+        # Migrations are one-shot; don't keep idle connections around
+        self.engine = create_engine(connection_string, poolclass=NullPool)
 
-    def _get_alembic_config(self) -> Config:
-        """Create Alembic configuration programmatically."""
+    @cached_property
+    def _alembic_config(self) -> Config:
+        """Alembic configuration, created programmatically on first use."""
         config = Config()
 
-        # Get migrations directory from package resources
-        migrations_path = importlib.resources.files("k3l.fcgraph.embeds.migrations")
-        script_location = str(migrations_path)
-
         # Configure Alembic
-        config.set_main_option("script_location", script_location)
+        config.set_main_option("script_location", _MIGRATIONS_PATH)
         config.set_main_option("sqlalchemy.url", self.connection_string)
         config.set_main_option("version_table", self.version_table)
         config.set_main_option("version_table_schema", self.schema)
@@ -53,6 +69,11 @@ class MigrationManager:
 
         return config
 
+    @cached_property
+    def _script_directory(self) -> ScriptDirectory:
+        """Alembic script directory, scanned on first use."""
+        return ScriptDirectory.from_config(self._alembic_config)
+
     def _ensure_schema_exists(self):
         """Ensure the target schema exists."""
         if self.schema != "public":
@@ -67,8 +88,7 @@ class MigrationManager:
             revision: Target revision (default: "head" for latest)
         """
         self._ensure_schema_exists()
-        config = self._get_alembic_config()
-        command.upgrade(config, revision)
+        command.upgrade(self._alembic_config, revision)
 
     def downgrade(self, revision: str) -> None:
         """Downgrade database to specified revision.
@@ -76,8 +96,7 @@ class MigrationManager:
         Args:
             revision: Target revision
         """
-        config = self._get_alembic_config()
-        command.downgrade(config, revision)
+        command.downgrade(self._alembic_config, revision)
 
     def current_revision(self) -> Optional[str]:
         """Get current database revision.
@@ -103,23 +122,23 @@ class MigrationManager:
         Returns:
             List of pending revision IDs
         """
-        config = self._get_alembic_config()
-        script = ScriptDirectory.from_config(config)
+        script = self._script_directory
 
         current = self.current_revision()
-        heads = script.get_heads()
 
         if not current:
             # No migrations applied yet
             return [rev.revision for rev in script.walk_revisions()]
 
-        pending = []
-        for head in heads:
-            for rev in script.iterate_revisions(head, current):
-                if rev.revision != current:
-                    pending.append(rev.revision)
-
-        return pending
+        # Walk all heads at once; dict.fromkeys dedupes revisions shared by
+        # merge heads while keeping order
+        return list(
+            dict.fromkeys(
+                rev.revision
+                for rev in script.iterate_revisions("heads", current)
+                if rev.revision != current
+            )
+        )
 
     def migration_history(self) -> list[dict]:
         """Get migration history.
@@ -127,8 +146,7 @@ class MigrationManager:
         Returns:
             List of migration info dictionaries
         """
-        config = self._get_alembic_config()
-        script = ScriptDirectory.from_config(config)
+        script = self._script_directory
 
         history = []
         for rev in script.walk_revisions():
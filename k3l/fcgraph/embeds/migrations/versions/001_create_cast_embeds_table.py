@@ -98,37 +98,7 @@ def upgrade() -> None:
         comment="Normalized cast embed data extracted from Farcaster casts",
     )
 
-    # Create indexes for efficient querying
-    op.create_index("ix_k3l_cast_embeds_cast_hash", "k3l_cast_embeds", ["cast_hash"])
-    op.create_index("ix_k3l_cast_embeds_cast_fid", "k3l_cast_embeds", ["cast_fid"])
-    op.create_index("ix_k3l_cast_embeds_embed_type", "k3l_cast_embeds", ["embed_type"])
-    op.create_index("ix_k3l_cast_embeds_url", "k3l_cast_embeds", ["url"])
-    op.create_index(
-        "ix_k3l_cast_embeds_quoted_cast",
-        "k3l_cast_embeds",
-        ["quoted_cast_hash", "quoted_cast_fid"],
-    )
-    op.create_index(
-        "ix_k3l_cast_embeds_processed_at", "k3l_cast_embeds", ["processed_at"]
-    )
-
-    # Create a partial index for URL embeds only
-    op.create_index(
-        "ix_k3l_cast_embeds_url_embeds_only",
-        "k3l_cast_embeds",
-        ["url"],
-        postgresql_where=sa.text("embed_type = 'url' AND url IS NOT NULL"),
-    )
-
-    # Create a partial index for cast quote embeds only
-    op.create_index(
-        "ix_k3l_cast_embeds_quote_embeds_only",
-        "k3l_cast_embeds",
-        ["quoted_cast_hash", "quoted_cast_fid"],
-        postgresql_where=sa.text(
-            "embed_type = 'cast_id' AND quoted_cast_hash IS NOT NULL"
-        ),
-    )
+    # Secondary indexes are built concurrently by revision 002
 
 
 def downgrade() -> None:
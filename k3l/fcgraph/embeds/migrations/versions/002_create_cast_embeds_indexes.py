@@ -0,0 +1,75 @@
+"""Create k3l_cast_embeds secondary indexes concurrently
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-15 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "002"
+down_revision: Union[str, None] = "001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (name, columns, partial index predicate)
+_INDEXES = [
+    ("ix_k3l_cast_embeds_cast_hash", ["cast_hash"], None),
+    ("ix_k3l_cast_embeds_cast_fid", ["cast_fid"], None),
+    ("ix_k3l_cast_embeds_embed_type", ["embed_type"], None),
+    ("ix_k3l_cast_embeds_url", ["url"], None),
+    (
+        "ix_k3l_cast_embeds_quoted_cast",
+        ["quoted_cast_hash", "quoted_cast_fid"],
+        None,
+    ),
+    ("ix_k3l_cast_embeds_processed_at", ["processed_at"], None),
+    # Partial index for URL embeds only
+    (
+        "ix_k3l_cast_embeds_url_embeds_only",
+        ["url"],
+        "embed_type = 'url' AND url IS NOT NULL",
+    ),
+    # Partial index for cast quote embeds only
+    (
+        "ix_k3l_cast_embeds_quote_embeds_only",
+        ["quoted_cast_hash", "quoted_cast_fid"],
+        "embed_type = 'cast_id' AND quoted_cast_hash IS NOT NULL",
+    ),
+]
+
+
+def upgrade() -> None:
+    """Create secondary indexes without blocking writes to k3l_cast_embeds.
+
+    CREATE INDEX CONCURRENTLY cannot run inside a transaction, so the indexes
+    are built in an autocommit block. IF NOT EXISTS keeps this a no-op for
+    databases whose indexes were created by an earlier revision of 001.
+    """
+    with op.get_context().autocommit_block():
+        for name, columns, where in _INDEXES:
+            op.create_index(
+                name,
+                "k3l_cast_embeds",
+                columns,
+                if_not_exists=True,
+                postgresql_concurrently=True,
+                postgresql_where=sa.text(where) if where else None,
+            )
+
+
+def downgrade() -> None:
+    """Drop k3l_cast_embeds secondary indexes."""
+    with op.get_context().autocommit_block():
+        for name, _, _ in reversed(_INDEXES):
+            op.drop_index(
+                name,
+                table_name="k3l_cast_embeds",
+                if_exists=True,
+                postgresql_concurrently=True,
+            )
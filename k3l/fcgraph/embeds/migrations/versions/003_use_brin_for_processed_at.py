@@ -0,0 +1,56 @@
+"""Use a BRIN index for k3l_cast_embeds.processed_at
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-15 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "003"
+down_revision: Union[str, None] = "002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Replace the processed_at btree with a much smaller BRIN index.
+
+    processed_at defaults to CURRENT_TIMESTAMP on insert, so it follows heap
+    order closely and is only ever scanned by range, which is what BRIN is for.
+    """
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_k3l_cast_embeds_processed_at",
+            table_name="k3l_cast_embeds",
+            if_exists=True,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_k3l_cast_embeds_processed_at",
+            "k3l_cast_embeds",
+            ["processed_at"],
+            postgresql_concurrently=True,
+            postgresql_using="brin",
+            postgresql_with={"pages_per_range": 32},
+        )
+
+
+def downgrade() -> None:
+    """Restore the processed_at btree index."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_k3l_cast_embeds_processed_at",
+            table_name="k3l_cast_embeds",
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_k3l_cast_embeds_processed_at",
+            "k3l_cast_embeds",
+            ["processed_at"],
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,50 @@
+"""Constrain k3l_cast_embeds hashes to 20 bytes
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-15 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "004"
+down_revision: Union[str, None] = "003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_CONSTRAINTS = [
+    ("ck_k3l_cast_embeds_cast_hash_length", "octet_length(cast_hash) = 20"),
+    (
+        "ck_k3l_cast_embeds_quoted_cast_hash_length",
+        "quoted_cast_hash IS NULL OR octet_length(quoted_cast_hash) = 20",
+    ),
+]
+
+
+def upgrade() -> None:
+    """Add 20-byte length checks on cast_hash and quoted_cast_hash.
+
+    The constraints are added NOT VALID and validated in a separate
+    transaction, so existing rows are checked without holding an exclusive
+    lock on the table. Each statement commits on its own, so a failed
+    validation leaves its NOT VALID constraint behind; it is dropped first
+    so that the upgrade can simply be rerun once the offending rows are
+    fixed.
+    """
+    with op.get_context().autocommit_block():
+        for name, condition in _CONSTRAINTS:
+            op.execute(f"ALTER TABLE k3l_cast_embeds DROP CONSTRAINT IF EXISTS {name}")
+            op.create_check_constraint(
+                name, "k3l_cast_embeds", condition, postgresql_not_valid=True
+            )
+            op.execute(f"ALTER TABLE k3l_cast_embeds VALIDATE CONSTRAINT {name}")
+
+
+def downgrade() -> None:
+    """Drop the hash length checks."""
+    for name, _ in reversed(_CONSTRAINTS):
+        op.drop_constraint(name, "k3l_cast_embeds", type_="check")
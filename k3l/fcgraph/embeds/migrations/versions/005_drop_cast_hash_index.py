@@ -0,0 +1,45 @@
+"""Drop the redundant k3l_cast_embeds.cast_hash index
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-15 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "005"
+down_revision: Union[str, None] = "004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Drop ix_k3l_cast_embeds_cast_hash.
+
+    cast_hash is the leading column of uq_cast_embed_index, which already
+    serves cast_hash-only lookups, so the standalone btree only adds write
+    amplification on every insert.
+    """
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_k3l_cast_embeds_cast_hash",
+            table_name="k3l_cast_embeds",
+            if_exists=True,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Restore the cast_hash index."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_k3l_cast_embeds_cast_hash",
+            "k3l_cast_embeds",
+            ["cast_hash"],
+            if_not_exists=True,
+            postgresql_concurrently=True,
+        )
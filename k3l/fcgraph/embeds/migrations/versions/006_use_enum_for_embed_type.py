@@ -0,0 +1,97 @@
+"""Store k3l_cast_embeds.embed_type as an enum
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-15 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "006"
+down_revision: Union[str, None] = "005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+embed_type = postgresql.ENUM("url", "cast_id", name="k3l_embed_type")
+
+# (name, columns, partial index predicate with {cast} after each embed type)
+_PARTIAL_INDEXES = [
+    (
+        "ix_k3l_cast_embeds_url_embeds_only",
+        ["url"],
+        "embed_type = 'url'{cast} AND url IS NOT NULL",
+    ),
+    (
+        "ix_k3l_cast_embeds_quote_embeds_only",
+        ["quoted_cast_hash", "quoted_cast_fid"],
+        "embed_type = 'cast_id'{cast} AND quoted_cast_hash IS NOT NULL",
+    ),
+]
+
+
+def _drop_partial_indexes() -> None:
+    """Drop the partial indexes whose predicates test embed_type."""
+    with op.get_context().autocommit_block():
+        for name, _, _ in _PARTIAL_INDEXES:
+            op.drop_index(
+                name,
+                table_name="k3l_cast_embeds",
+                if_exists=True,
+                postgresql_concurrently=True,
+            )
+
+
+def _create_partial_indexes(cast: str) -> None:
+    """Create the partial indexes, casting embed types in predicates by cast."""
+    with op.get_context().autocommit_block():
+        for name, columns, where in _PARTIAL_INDEXES:
+            op.create_index(
+                name,
+                "k3l_cast_embeds",
+                columns,
+                if_not_exists=True,
+                postgresql_concurrently=True,
+                postgresql_where=sa.text(where.format(cast=cast)),
+            )
+
+
+def upgrade() -> None:
+    """Convert embed_type from VARCHAR(32) to the k3l_embed_type enum.
+
+    An enum value takes 4 bytes instead of a varlena string in both the heap
+    and the indexes. The partial indexes testing embed_type are dropped first:
+    their predicates compare it as text, which the ALTER would turn into an
+    enum-to-text cast that is not immutable and so cannot be rebuilt. They
+    are recreated concurrently afterwards with predicates on the enum.
+    """
+    _drop_partial_indexes()
+    embed_type.create(op.get_bind(), checkfirst=True)
+    op.alter_column(
+        "k3l_cast_embeds",
+        "embed_type",
+        type_=embed_type,
+        existing_nullable=False,
+        postgresql_using="embed_type::k3l_embed_type",
+    )
+    _create_partial_indexes("::k3l_embed_type")
+
+
+def downgrade() -> None:
+    """Convert embed_type back to VARCHAR(32), with text partial indexes."""
+    _drop_partial_indexes()
+    op.alter_column(
+        "k3l_cast_embeds",
+        "embed_type",
+        type_=sa.String(32),
+        existing_type=embed_type,
+        existing_nullable=False,
+        postgresql_using="embed_type::text",
+    )
+    embed_type.drop(op.get_bind(), checkfirst=True)
+    _create_partial_indexes("")
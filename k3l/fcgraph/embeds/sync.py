@@ -11,6 +11,7 @@ Key features:
 - Batch processing with configurable sizes
 - Comprehensive error reporting and statistics
 - Connection-based API for production use
+- Optional uvloop event loop via install_uvloop()
 
 Example:
     >>> import asyncio
@@ -36,18 +37,155 @@ Example:
 """
 
 import asyncio
-import json
+import contextlib
 import logging
+import weakref
+from concurrent.futures import Executor
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
 import asyncpg
-from sqlalchemy import create_engine
 
-from .types import Embeds
+from .types import parse_embed_records
 
 logger = logging.getLogger(__name__)
 
+# Column order of the tuples written to k3l_cast_embeds
+_EMBED_COLUMNS = (
+    "cast_hash",
+    "cast_fid",
+    "embed_index",
+    "embed_type",
+    "url",
+    "quoted_cast_hash",
+    "quoted_cast_fid",
+    "raw_embed_data",
+)
+
+_EMBED_COLUMNS_SQL = ", ".join(_EMBED_COLUMNS)
+
+# A k3l_cast_embeds row as a record in _EMBED_COLUMNS order
+_EmbedRow = Tuple[Any, ...]
+
+# Columns that are overwritten when an embed already exists
+_EMBED_VALUE_COLUMNS = tuple(
+    column for column in _EMBED_COLUMNS if column not in ("cast_hash", "embed_index")
+)
+_EMBED_UPDATE_SQL = ", ".join(
+    f"{column} = EXCLUDED.{column}" for column in _EMBED_VALUE_COLUMNS
+)
+_EMBED_CHANGED_SQL = "({}) IS DISTINCT FROM ({})".format(
+    ", ".join(f"e.{column}" for column in _EMBED_VALUE_COLUMNS),
+    ", ".join(f"EXCLUDED.{column}" for column in _EMBED_VALUE_COLUMNS),
+)
+
+# Batches smaller than this are staged with executemany; larger ones use COPY
+_COPY_MIN_ROWS = 100
+
+# Pools created by get_pool(), keyed by event loop and DSN; a pool (like the
+# lock guarding its creation) only works on the loop it was created on
+_pools: Dict[Tuple[asyncio.AbstractEventLoop, str], asyncpg.Pool] = {}
+_pools_locks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _forget_closed_loop_pools() -> None:
+    """Drop pools whose event loop has been closed; they can no longer be used."""
+    for key in [key for key in _pools if key[0].is_closed()]:
+        del _pools[key]
+
+
+async def get_pool(dsn: str, **kwargs) -> asyncpg.Pool:
+    """Get a long-lived asyncpg pool for the given DSN, creating it on first use.
+
+    Reusing one pool across sync runs amortizes the TCP/TLS/authentication
+    handshake over many queries instead of paying it on every connect.
+
+    Args:
+        dsn: Database connection string
+        **kwargs: Extra arguments for asyncpg.create_pool(), overriding the
+            defaults (min_size=10, max_size=50, max_queries=50000,
+            max_inactive_connection_lifetime=300). Only used when the pool
+            is first created.
+
+    Returns:
+        asyncpg.Pool shared by all callers using the same DSN on the running
+        event loop; each event loop (e.g. each asyncio.run()) gets its own
+    """
+    loop = asyncio.get_running_loop()
+    _forget_closed_loop_pools()
+    lock = _pools_locks.get(loop)
+    if lock is None:
+        lock = _pools_locks[loop] = asyncio.Lock()
+
+    async with lock:
+        pool = _pools.get((loop, dsn))
+        if pool is None:
+            options = {
+                "min_size": 10,
+                "max_size": 50,
+                "max_queries": 50000,
+                "max_inactive_connection_lifetime": 300,
+            }
+            options.update(kwargs)
+            pool = await asyncpg.create_pool(dsn, **options)
+            _pools[(loop, dsn)] = pool
+        return pool
+
+
+async def close_pools() -> None:
+    """Close all pools created by get_pool() on the running event loop.
+
+    Call this before the event loop ends so that its connections are closed
+    cleanly.
+    """
+    loop = asyncio.get_running_loop()
+    _forget_closed_loop_pools()
+    for key in [key for key in _pools if key[0] is loop]:
+        await _pools.pop(key).close()
+
+
+def install_uvloop() -> bool:
+    """Make asyncio use uvloop's event loop, if uvloop is installed.
+
+    asyncpg is noticeably faster on uvloop. Call this before creating any
+    event loop, connection or pool (e.g. before asyncio.run() or
+    sync_embeds()).
+
+    Returns:
+        True if uvloop was installed as the event loop policy, False if uvloop
+        is not available
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return False
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return True
+
+
+@contextlib.asynccontextmanager
+async def _acquire(
+    conn: Union[asyncpg.Connection, asyncpg.Pool],
+) -> AsyncIterator[asyncpg.Connection]:
+    """Yield a connection, acquiring one from the pool if given a pool."""
+    if isinstance(conn, asyncpg.Pool):
+        async with conn.acquire() as pooled_conn:
+            yield pooled_conn
+    else:
+        yield conn
+
 
 class EmbedSyncResult:
     """Result of embed synchronization operation.
@@ -58,9 +196,13 @@ class EmbedSyncResult:
     Attributes:
         casts_processed (int): Number of casts processed from source
         embeds_extracted (int): Number of embeds successfully parsed
-        embeds_inserted (int): Number of embeds successfully inserted to target
+        embeds_inserted (int): Number of embeds successfully upserted to target
         errors (int): Total number of errors encountered
         max_updated_at (datetime, optional): Latest updated_at timestamp processed
+        max_id (int, optional): id of the last cast processed at max_updated_at;
+            pass both as min_updated_at and min_id to resume after it. If a
+            partition failed to read all of its casts, both are capped at where
+            it stopped, so resuming from them never skips unread casts.
         error_details (List[str]): Detailed error messages for debugging
 
     Examples:
@@ -78,242 +220,464 @@ class EmbedSyncResult:
         self.embeds_inserted = 0
         self.errors = 0
         self.max_updated_at: Optional[datetime] = None
+        self.max_id: Optional[int] = None
         self.error_details: List[str] = []
+        # Set when reading source casts stopped before the end
+        self._read_error = False
+
+    def merge(self, other: "EmbedSyncResult") -> None:
+        """Add the statistics of another (partial) result to this one."""
+        self.casts_processed += other.casts_processed
+        self.embeds_extracted += other.embeds_extracted
+        self.embeds_inserted += other.embeds_inserted
+        self.errors += other.errors
+        self.error_details.extend(other.error_details)
+        self._read_error = self._read_error or other._read_error
+        if other.max_updated_at and (
+            not self.max_updated_at
+            or (other.max_updated_at, other.max_id) > (self.max_updated_at, self.max_id)
+        ):
+            self.max_updated_at = other.max_updated_at
+            self.max_id = other.max_id
 
 
 async def sync_embeds_async(
-    source_conn: asyncpg.Connection,
-    target_conn: asyncpg.Connection,
+    source_conn: Union[asyncpg.Connection, asyncpg.Pool],
+    target_conn: Union[asyncpg.Connection, asyncpg.Pool],
     min_updated_at: datetime,
     batch_size: int = 1000,
     source_schema: str = "neynarv2",
     target_schema: str = "public",
+    partitions: int = 1,
+    min_id: Optional[int] = None,
+    writers: int = 1,
+    executor: Optional[Executor] = None,
 ) -> EmbedSyncResult:
     """Asynchronously synchronize embeds from source casts table to normalized embeds table.
 
     Args:
-        source_conn: asyncpg connection to source database
-        target_conn: asyncpg connection to target database
+        source_conn: asyncpg connection or pool for source database
+        target_conn: asyncpg connection or pool for target database
         min_updated_at: Minimum updated_at timestamp to process
         batch_size: Number of casts to process in each batch
         source_schema: Schema containing source casts table (default: "neynarv2")
         target_schema: Schema containing target embeds table (default: "public")
+        partitions: Number of fid buckets (fid % partitions) to sync concurrently,
+            each on its own pair of connections (default: 1). Values above 1
+            require source_conn and target_conn to be pools; concurrency is
+            capped so that workers never wait on each other for connections.
+            All partitions sync casts up to the same max(updated_at), taken
+            before they start, which is reported as the result's watermark.
+        min_id: If given, only casts after (min_updated_at, min_id) in
+            (updated_at, id) order are processed, e.g. to resume after the
+            max_updated_at and max_id of a previous result
+        writers: Number of target connections writing batches concurrently
+            (per partition) while source casts are read (default: 1). Values
+            above 1 require target_conn to be a pool.
+        executor: If given, batches are parsed in this executor instead of on
+            the event loop thread. Pass a ProcessPoolExecutor to parse on
+            several cores while the event loop keeps the connections busy.
 
     Returns:
         EmbedSyncResult with processing statistics
-    """
-    result = EmbedSyncResult()
 
-    try:
-        # Process in batches
-        offset = 0
-        while True:
-            batch_result = await _process_batch_async(
-                source_conn,
-                target_conn,
-                min_updated_at,
-                offset,
-                batch_size,
-                source_schema,
-                target_schema,
-            )
+    Batches are committed with synchronous_commit off, so the most recent
+    batches may be lost if the target server crashes. The sync is idempotent
+    and the source database remains the source of truth: after a crash,
+    rerun it from a min_updated_at no later than the last one used.
 
-            # Accumulate results
-            result.casts_processed += batch_result.casts_processed
-            result.embeds_extracted += batch_result.embeds_extracted
-            result.embeds_inserted += batch_result.embeds_inserted
-            result.errors += batch_result.errors
-            result.error_details.extend(batch_result.error_details)
+    Casts are read in (updated_at, id) order; the source casts table should
+    have a btree index on (updated_at, id) for this to be an index scan.
+    Casts without embeds are filtered out by the source query and are not
+    counted in casts_processed.
+    """
+    if writers > 1 and not isinstance(target_conn, asyncpg.Pool):
+        raise ValueError("Writing with more than one connection requires a pool")
 
-            # Update max timestamp
-            if batch_result.max_updated_at:
-                if (
-                    not result.max_updated_at
-                    or batch_result.max_updated_at > result.max_updated_at
-                ):
-                    result.max_updated_at = batch_result.max_updated_at
+    if partitions > 1:
+        return await _sync_partitions_async(
+            source_conn,
+            target_conn,
+            min_updated_at,
+            batch_size,
+            source_schema,
+            target_schema,
+            partitions,
+            min_id,
+            writers,
+            executor,
+        )
 
-            # Check if we're done
-            if batch_result.casts_processed < batch_size:
-                break
+    async with _acquire(source_conn) as source_conn:
+        return await _sync_embeds_async(
+            source_conn,
+            target_conn,
+            min_updated_at,
+            batch_size,
+            source_schema,
+            target_schema,
+            min_id,
+            writers,
+            executor,
+        )
 
-            offset += batch_size
 
-    except Exception as e:
-        logger.error(f"Error during embed sync: {e}")
-        result.errors += 1
-        result.error_details.append(f"Sync error: {str(e)}")
+async def _sync_partitions_async(
+    source_pool: asyncpg.Pool,
+    target_pool: asyncpg.Pool,
+    min_updated_at: datetime,
+    batch_size: int,
+    source_schema: str,
+    target_schema: str,
+    partitions: int,
+    min_id: Optional[int],
+    writers: int,
+    executor: Optional[Executor],
+) -> EmbedSyncResult:
+    """Sync fid buckets concurrently, each on connections from the pools."""
+    if not (
+        isinstance(source_pool, asyncpg.Pool) and isinstance(target_pool, asyncpg.Pool)
+    ):
+        raise ValueError("Syncing more than one partition requires connection pools")
+
+    # Each worker holds one source and up to `writers` target connections
+    if source_pool is target_pool:
+        limit = source_pool.get_max_size() // (1 + writers)
+    else:
+        limit = min(source_pool.get_max_size(), target_pool.get_max_size() // writers)
+    semaphore = asyncio.Semaphore(max(limit, 1))
+
+    # Partitions read in their own transactions at different times, so each
+    # one would see casts updated up to a different point. Bounding them all
+    # by the same upper bound keeps the merged watermark from skipping casts
+    # that a partition finished before they were updated.
+    max_updated_at = await source_pool.fetchval(
+        f"SELECT max(updated_at) FROM {source_schema}.casts"
+    )
+    if max_updated_at is None or max_updated_at < min_updated_at:
+        return EmbedSyncResult()
+
+    async def sync_partition(partition: int) -> EmbedSyncResult:
+        async with semaphore:
+            async with _acquire(source_pool) as source_conn:
+                return await _sync_embeds_async(
+                    source_conn,
+                    target_pool,
+                    min_updated_at,
+                    batch_size,
+                    source_schema,
+                    target_schema,
+                    min_id,
+                    writers,
+                    executor,
+                    (partition, partitions),
+                    max_updated_at,
+                )
 
+    partition_results = await asyncio.gather(
+        *(sync_partition(partition) for partition in range(partitions))
+    )
+    result = EmbedSyncResult()
+    for partition_result in partition_results:
+        result.merge(partition_result)
+
+    # Every partition has read all of its casts up to the bound; casts
+    # without embeds are not returned, so the last one read may be earlier
+    if result.max_updated_at != max_updated_at:
+        result.max_updated_at, result.max_id = max_updated_at, None
+
+    # Casts after the point where a partition failed to read are still
+    # unsynced, so the watermark must not move past the earliest such point
+    failed = [r for r in partition_results if r._read_error]
+    if failed:
+        if any(r.max_updated_at is None for r in failed):
+            result.max_updated_at, result.max_id = min_updated_at, min_id
+        else:
+            stopped = min(failed, key=lambda r: (r.max_updated_at, r.max_id))
+            result.max_updated_at = stopped.max_updated_at
+            result.max_id = stopped.max_id
     return result
 
 
-async def _process_batch_async(
+async def _sync_embeds_async(
     source_conn: asyncpg.Connection,
-    target_conn: asyncpg.Connection,
+    target: Union[asyncpg.Connection, asyncpg.Pool],
     min_updated_at: datetime,
-    offset: int,
     batch_size: int,
     source_schema: str,
     target_schema: str,
+    min_id: Optional[int] = None,
+    writers: int = 1,
+    executor: Optional[Executor] = None,
+    partition: Optional[Tuple[int, int]] = None,
+    max_updated_at: Optional[datetime] = None,
 ) -> EmbedSyncResult:
-    """Process a single batch of casts asynchronously."""
-    result = EmbedSyncResult()
+    """Run the batch loop of sync_embeds_async() on an acquired source connection.
 
-    # Query source casts
-    query = f"""
-    SELECT 
-        hash,
-        fid,
-        embeds,
-        updated_at
-    FROM {source_schema}.casts 
-    WHERE updated_at >= $1
-    ORDER BY updated_at, id
-    OFFSET $2 LIMIT $3
+    Batches are written by `writers` consumers, each on its own connection
+    acquired from target (which must then be a pool). If partition is given
+    as (remainder, modulus), only casts whose fid has that remainder are
+    synced. If max_updated_at is given, casts updated after it are not synced.
     """
+    result = EmbedSyncResult()
+
+    try:
+        # Prepare statements once per run and reuse them for every batch
+        # Seek on (updated_at, id), strictly after min_id if one is given
+        if min_id is None:
+            conditions = ["updated_at >= $1"]
+            args: List[Any] = [min_updated_at]
+        else:
+            conditions = ["(updated_at, id) > ($1, $2)"]
+            args = [min_updated_at, min_id]
+        if partition:
+            conditions.append(f"fid % ${len(args) + 2} = ${len(args) + 1}")
+            args.extend(partition)
+        if max_updated_at is not None:
+            conditions.append(f"updated_at <= ${len(args) + 1}")
+            args.append(max_updated_at)
+        # Casts without embeds (the majority) are never shipped to the client
+        conditions.append(
+            "embeds IS NOT NULL AND embeds::text NOT IN ('', '[]', '\"\"', 'null')"
+        )
+        where = " AND ".join(conditions)
+        select_stmt = await source_conn.prepare(f"""
+        SELECT 
+            id,
+            hash,
+            fid,
+            -- Cast to text so embeds arrive as the original JSON text,
+            -- whatever codec the connection was set up with, and
+            -- raw_embed_data is passed through without a decode/encode
+            embeds::text AS embeds,
+            updated_at
+        FROM {source_schema}.casts 
+        WHERE {where}
+        ORDER BY updated_at, id
+        """)
+
+        # Fetch and parse the next batches while the current ones are being
+        # written; the bounded queue caps how far reading can run ahead
+        queue: asyncio.Queue = asyncio.Queue(maxsize=writers + 1)
+        loop = asyncio.get_running_loop()
+
+        async def produce() -> None:
+            try:
+                # Stream source casts through a server-side cursor; cursors
+                # only live inside a transaction, which only ever reads
+                async with source_conn.transaction(readonly=True):
+                    cursor = await select_stmt.cursor(*args)
+
+                    # Process in batches
+                    while True:
+                        casts = await cursor.fetch(batch_size)
+                        if executor is None:
+                            batch = _parse_batch(casts)
+                        else:
+                            # Records don't pickle; ship them as dicts
+                            batch = await loop.run_in_executor(
+                                executor, _parse_batch, [dict(c) for c in casts]
+                            )
+                        await queue.put(batch)
+                        # A queue that stays full means writing is the
+                        # bottleneck; one that stays empty, reading/parsing
+                        logger.debug(
+                            "Queued %d casts, %d of %d batches pending",
+                            len(casts),
+                            queue.qsize(),
+                            queue.maxsize,
+                        )
+
+                        # Check if we're done
+                        if len(casts) < batch_size:
+                            break
+            except Exception as e:
+                logger.error("Error reading source casts: %s", e)
+                result._read_error = True
+                result.errors += 1
+                result.error_details.append(f"Sync error: {str(e)}")
+            for _ in range(writers):
+                await queue.put(None)
+
+        async def consume() -> None:
+            async with _acquire(target) as target_conn:
+                # Batches are staged in a session-private temp table
+                # (unlogged, and emptied on commit) before being merged into
+                # k3l_cast_embeds
+                await target_conn.execute(f"""
+                CREATE TEMP TABLE IF NOT EXISTS _stage_k3l_cast_embeds
+                ON COMMIT DELETE ROWS AS
+                SELECT {_EMBED_COLUMNS_SQL} FROM {target_schema}.k3l_cast_embeds
+                WITH NO DATA
+                """)
+                stage_stmt = await target_conn.prepare(f"""
+                INSERT INTO _stage_k3l_cast_embeds ({_EMBED_COLUMNS_SQL})
+                VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
+                """)
+                merge_stmt = await target_conn.prepare(f"""
+                WITH trimmed AS (
+                    DELETE FROM {target_schema}.k3l_cast_embeds AS e
+                    USING (
+                        SELECT cast_hash, count(*) AS embed_count
+                        FROM _stage_k3l_cast_embeds
+                        GROUP BY cast_hash
+                    ) AS s
+                    WHERE e.cast_hash = s.cast_hash
+                    AND e.embed_index >= s.embed_count
+                )
+                INSERT INTO {target_schema}.k3l_cast_embeds AS e ({_EMBED_COLUMNS_SQL})
+                SELECT {_EMBED_COLUMNS_SQL} FROM _stage_k3l_cast_embeds
+                ON CONFLICT (cast_hash, embed_index) DO UPDATE
+                SET {_EMBED_UPDATE_SQL}, updated_at = CURRENT_TIMESTAMP
+                WHERE {_EMBED_CHANGED_SQL}
+                """)
+
+                while True:
+                    batch = await queue.get()
+                    if batch is None:
+                        break
+                    batch_result, embed_rows_by_hash = batch
+                    await _insert_batch_async(
+                        batch_result,
+                        embed_rows_by_hash,
+                        stage_stmt,
+                        merge_stmt,
+                        target_conn,
+                    )
+                    result.merge(batch_result)
+
+        # If any task fails, don't leave the others blocked on the queue
+        tasks = [asyncio.ensure_future(produce())]
+        tasks.extend(asyncio.ensure_future(consume()) for _ in range(writers))
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    except Exception as e:
+        logger.error("Error during embed sync: %s", e)
+        result._read_error = True
+        result.errors += 1
+        result.error_details.append(f"Sync error: {str(e)}")
+
+    return result
+
+
+def _parse_batch(
+    casts: Sequence[Mapping[str, Any]],
+) -> Tuple[EmbedSyncResult, Dict[bytes, List[_EmbedRow]]]:
+    """Parse a single batch of source casts into embed rows by cast hash."""
+    result = EmbedSyncResult()
 
-    casts = await source_conn.fetch(query, min_updated_at, offset, batch_size)
     result.casts_processed = len(casts)
 
+    # Prepare batch data for insertion, keyed by the (already unique) cast
+    # hash so that a cast seen twice in a batch is only written once, with
+    # its latest version
+    embed_rows_by_hash: Dict[bytes, List[_EmbedRow]] = {}
+
     if not casts:
-        return result
+        return result, embed_rows_by_hash
 
-    # Prepare batch data for insertion
-    embed_rows = []
+    # Casts arrive in (updated_at, id) order
+    result.max_updated_at = casts[-1]["updated_at"]
+    result.max_id = casts[-1]["id"]
 
     for cast in casts:
         try:
-            # Update max timestamp
-            if not result.max_updated_at or cast["updated_at"] > result.max_updated_at:
-                result.max_updated_at = cast["updated_at"]
-
-            # Parse embeds using the library
-            embeds_data = cast["embeds"]
-            if not embeds_data:
+            # Parse embeds using the library; the source JSON text itself is
+            # stored untouched as raw_embed_data, which the server parses
+            # into jsonb once, with no decode/encode round-trip here
+            raw_data_json = cast["embeds"]
+            if not raw_data_json:
                 continue
 
-            # Handle both JSON and string formats
-            if isinstance(embeds_data, str):
-                # If it's a quoted string (from JSONB storage), unquote it first
-                if embeds_data.startswith('"') and embeds_data.endswith('"'):
-                    # Remove outer quotes and unescape
-                    embeds_data = (
-                        embeds_data[1:-1].replace('\\"', '"').replace("\\\\", "\\")
-                    )
-                embeds = Embeds.model_validate(embeds_data)
-            else:
-                # Already parsed JSON
-                embeds = Embeds.model_validate(embeds_data)
+            # k3l_cast_embeds only accepts 20-byte hashes; catching a bad one
+            # here fails just this cast instead of the whole batch's merge
+            if len(cast["hash"]) != 20:
+                raise ValueError(
+                    f"Cast hash must be exactly 20 bytes, got {len(cast['hash'])}"
+                )
+
+            # The source query always yields text. A JSON string wrapping the
+            # serialized array (as left by some JSONB writers) is unwrapped by
+            # the parser, with proper JSON unescaping.
+            # Embeds are parsed straight into column values, without
+            # building Embed models.
+            records = parse_embed_records(raw_data_json)
 
-            result.embeds_extracted += len(embeds)
+            result.embeds_extracted += len(records)
 
             # Convert each embed to database row
-            for embed_index, embed in enumerate(embeds):
-                row_data = _embed_to_row(
-                    cast["hash"],
-                    cast["fid"],
-                    embed_index,
-                    embed,
-                    embeds_data,  # Original raw data
-                )
-                embed_rows.append(row_data)
+            cast_hash = cast["hash"]
+            cast_fid = cast["fid"]
+            embed_rows_by_hash[cast_hash] = [
+                (cast_hash, cast_fid, embed_index, *record, raw_data_json)
+                for embed_index, record in enumerate(records)
+            ]
 
         except Exception as e:
-            logger.warning(f"Error parsing embeds for cast {cast['hash'].hex()}: {e}")
+            # Only failures pay for hex-encoding the hash, and only once
+            cast_hash_hex = cast["hash"].hex()
+            logger.warning("Error parsing embeds for cast %s: %s", cast_hash_hex, e)
             result.errors += 1
             result.error_details.append(
-                f"Parse error for cast {cast['hash'].hex()}: {str(e)}"
+                f"Parse error for cast {cast_hash_hex}: {str(e)}"
             )
             continue
 
-    # Batch insert to target database
-    if embed_rows:
+    return result, embed_rows_by_hash
+
+
+async def _insert_batch_async(
+    result: EmbedSyncResult,
+    embed_rows_by_hash: Dict[bytes, List[_EmbedRow]],
+    stage_stmt: asyncpg.prepared_stmt.PreparedStatement,
+    merge_stmt: asyncpg.prepared_stmt.PreparedStatement,
+    target_conn: asyncpg.Connection,
+) -> None:
+    """Write a parsed batch to the target, recording the outcome in result."""
+    if embed_rows_by_hash:
         try:
             async with target_conn.transaction():
-                # Delete existing embeds for these casts (for upsert behavior)
-                cast_hashes = [row["cast_hash"] for row in embed_rows]
-                unique_hashes = list(set(cast_hashes))
-
+                # Don't wait for the WAL flush on commit; a batch lost to a
+                # crash is simply synced again on the next run
                 await target_conn.execute(
-                    f"""
-                DELETE FROM {target_schema}.k3l_cast_embeds 
-                WHERE cast_hash = ANY($1)
-                """,
-                    unique_hashes,
+                    "SET LOCAL synchronous_commit = off; SET LOCAL work_mem = '256MB'"
                 )
 
                 # Prepare data for batch insert
                 insert_data = [
-                    (
-                        row["cast_hash"],
-                        row["cast_fid"],
-                        row["embed_index"],
-                        row["embed_type"],
-                        row["url"],
-                        row["quoted_cast_hash"],
-                        row["quoted_cast_fid"],
-                        row["raw_embed_data"],
-                    )
+                    row
+                    for embed_rows in embed_rows_by_hash.values()
                     for row in embed_rows
                 ]
 
-                # Batch insert new embeds
-                await target_conn.executemany(
-                    f"""
-                INSERT INTO {target_schema}.k3l_cast_embeds (
-                    cast_hash, cast_fid, embed_index, embed_type,
-                    url, quoted_cast_hash, quoted_cast_fid, raw_embed_data
-                ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
-                """,
-                    insert_data,
-                )
+                # Stage the rows; COPY streams all rows in one protocol
+                # exchange instead of one INSERT per row
+                if len(insert_data) < _COPY_MIN_ROWS:
+                    await stage_stmt.executemany(insert_data)
+                else:
+                    await target_conn.copy_records_to_table(
+                        "_stage_k3l_cast_embeds",
+                        records=insert_data,
+                        columns=_EMBED_COLUMNS,
+                    )
 
-                result.embeds_inserted = len(embed_rows)
+                # Upsert server-side, rewriting only embeds that changed, and
+                # drop embeds past the new end of each cast's embeds list
+                await merge_stmt.fetch()
+
+                # Every staged embed is now in place, whether written or
+                # already up to date
+                result.embeds_inserted = len(insert_data)
 
         except Exception as e:
-            logger.error(f"Error inserting batch: {e}")
+            logger.error("Error inserting batch: %s", e)
             result.errors += 1
             result.error_details.append(f"Insert error: {str(e)}")
 
-    return result
-
-
-def _embed_to_row(
-    cast_hash: bytes, cast_fid: int, embed_index: int, embed, raw_embed_data: Any
-) -> Dict[str, Any]:
-    """Convert an Embed object to database row data."""
-
-    # Convert raw_embed_data to JSON string if needed
-    if isinstance(raw_embed_data, str):
-        raw_data_json = raw_embed_data
-    else:
-        raw_data_json = json.dumps(raw_embed_data)
-
-    if embed.url:
-        return {
-            "cast_hash": cast_hash,
-            "cast_fid": cast_fid,
-            "embed_index": embed_index,
-            "embed_type": "url",
-            "url": embed.url,
-            "quoted_cast_hash": None,
-            "quoted_cast_fid": None,
-            "raw_embed_data": raw_data_json,
-        }
-    elif embed.cast_id:
-        return {
-            "cast_hash": cast_hash,
-            "cast_fid": cast_fid,
-            "embed_index": embed_index,
-            "embed_type": "cast_id",
-            "url": None,
-            "quoted_cast_hash": embed.cast_id.hash,
-            "quoted_cast_fid": embed.cast_id.fid,
-            "raw_embed_data": raw_data_json,
-        }
-    else:
-        raise ValueError("Embed must have either url or cast_id")
-
 
 async def _sync_embeds_with_connection_strings(
     source_connection_string: str,
@@ -3,76 +3,94 @@
 
 import asyncio
 import sys
-from datetime import datetime, timezone
+from datetime import datetime
 
-from k3l.fcgraph.embeds import sync_embeds_async
+import asyncpg
 
+from k3l.fcgraph.embeds import install_uvloop, sync_embeds_async
 
-async def setup_test_data(local_connection):
+
+async def setup_test_data(pool):
     """Set up test data using asyncpg."""
     try:
-        import asyncpg
-
-        conn = await asyncpg.connect(local_connection)
-
-        # Create test schema and table
-        await conn.execute("CREATE SCHEMA IF NOT EXISTS test_neynar")
-        await conn.execute(
-            """
-        CREATE TABLE IF NOT EXISTS test_neynar.casts (
-            id BIGSERIAL PRIMARY KEY,
-            hash BYTEA NOT NULL,
-            fid BIGINT NOT NULL,
-            embeds JSONB NOT NULL DEFAULT '{}',
-            updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
-        )
-        """
-        )
-
-        # Clear existing test data
-        await conn.execute("DELETE FROM test_neynar.casts")
-
-        # Insert test data with various embed formats
-        test_data = [
-            # Well-formed JSON
-            (
-                b"\\x1234567890123456789012345678901234567890",
-                123,
-                '[{"url": "https://example.com/test1.jpg"}]',
-            ),
-            # Malformed JSON string (single quotes) - store as string in JSONB
-            (
-                b"\\x2345678901234567890123456789012345678901",
-                456,
-                "\"[{'url': 'https://example.com/test2.jpg'}, {'url': 'https://example.com/test3.jpg'}]\"",
-            ),
-            # Cast quote embed - store as string
-            (
-                b"\\x3456789012345678901234567890123456789012",
-                789,
-                "\"[{'castId': {'fid': 999, 'hash': {'data': [1,2,3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18,19,20], 'type': 'Buffer'}}}]\"",
-            ),
-            # Mixed embeds - store as string
-            (
-                b"\\x4567890123456789012345678901234567890123",
-                101112,
-                "\"[{'url': 'https://example.com/mixed.jpg'}, {'castId': {'fid': 888, 'hash': {'data': [21,22,23,24,25,26,27,28,29,30,31,32,33,34,35,36,37,38,39,40], 'type': 'Buffer'}}}]\"",
-            ),
-        ]
-
-        for hash_val, fid, embeds in test_data:
+        # Set everything up in one transaction, committed (and flushed) once
+        async with pool.acquire() as conn, conn.transaction():
+            # Create test schema and table, indexed for the sync's scan order
+            await conn.execute("CREATE SCHEMA IF NOT EXISTS test_neynar")
             await conn.execute(
                 """
-            INSERT INTO test_neynar.casts (hash, fid, embeds, updated_at) 
-            VALUES ($1, $2, $3, $4)
-            """,
-                hash_val,
-                fid,
-                embeds,
-                datetime.now(),
+            CREATE TABLE IF NOT EXISTS test_neynar.casts (
+                id BIGSERIAL PRIMARY KEY,
+                hash BYTEA NOT NULL,
+                fid BIGINT NOT NULL,
+                embeds JSONB NOT NULL DEFAULT '{}',
+                updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+            );
+            CREATE INDEX IF NOT EXISTS casts_embeds_updated_at_id_idx
+                ON test_neynar.casts (updated_at, id)
+                WHERE embeds IS NOT NULL
+                    AND embeds::text NOT IN ('', '[]', '""', 'null');
+            """
             )
 
-        await conn.close()
+            # Clear existing test data
+            await conn.execute("TRUNCATE test_neynar.casts RESTART IDENTITY")
+
+            # Insert test data with various embed formats
+            test_data = [
+                # Well-formed JSON
+                (
+                    bytes.fromhex("1234567890123456789012345678901234567890"),
+                    123,
+                    '[{"url": "https://example.com/test1.jpg"}]',
+                ),
+                # Malformed JSON string (single quotes) - store as string in JSONB
+                (
+                    bytes.fromhex("2345678901234567890123456789012345678901"),
+                    456,
+                    "\"[{'url': 'https://example.com/test2.jpg'}, {'url': 'https://example.com/test3.jpg'}]\"",
+                ),
+                # Cast quote embed with a Node.js Buffer hash
+                (
+                    bytes.fromhex("3456789012345678901234567890123456789012"),
+                    789,
+                    '[{"castId": {"fid": 999, "hash": {"data": [1,2,3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18,19,20], "type": "Buffer"}}}]',
+                ),
+                # Mixed embeds
+                (
+                    bytes.fromhex("4567890123456789012345678901234567890123"),
+                    101112,
+                    '[{"url": "https://example.com/mixed.jpg"}, {"castId": {"fid": 888, "hash": {"data": [21,22,23,24,25,26,27,28,29,30,31,32,33,34,35,36,37,38,39,40], "type": "Buffer"}}}]',
+                ),
+            ]
+
+            # One timestamp for the whole batch, so all rows share a window
+            now = datetime.now()
+            records = [
+                (hash_val, fid, embeds, now) for hash_val, fid, embeds in test_data
+            ]
+            columns = ["hash", "fid", "embeds", "updated_at"]
+
+            # COPY streams every row in one go; fall back to a batched INSERT where
+            # COPY is unavailable (e.g. behind some connection poolers). The
+            # savepoint keeps a rejected COPY from aborting the transaction.
+            try:
+                async with conn.transaction():
+                    await conn.copy_records_to_table(
+                        "casts",
+                        schema_name="test_neynar",
+                        columns=columns,
+                        records=records,
+                    )
+            except asyncpg.PostgresError:
+                # Parse and plan the INSERT once, then bind every row against it
+                insert_stmt = await conn.prepare(
+                    """
+                INSERT INTO test_neynar.casts (hash, fid, embeds, updated_at)
+                VALUES ($1, $2, $3, $4)
+                """
+                )
+                await insert_stmt.executemany(records)
         print("✓ Test data created")
         return True
 
@@ -81,41 +99,46 @@ async def setup_test_data(local_connection):
         return False
 
 
-async def verify_results(local_connection):
+async def verify_results(pool):
     """Verify sync results using asyncpg."""
     try:
-        import asyncpg
-
-        conn = await asyncpg.connect(local_connection)
-
-        # Check total embeds inserted
-        total_embeds = await conn.fetchval("SELECT COUNT(*) FROM k3l_cast_embeds")
-        print(f"✓ Total embeds in target table: {total_embeds}")
-
-        # Check embed types
-        embed_types = await conn.fetch(
-            "SELECT embed_type, COUNT(*) FROM k3l_cast_embeds GROUP BY embed_type"
-        )
-        for row in embed_types:
-            print(f"  {row['embed_type']}: {row['count']}")
-
-        # Show sample data
-        sample_data = await conn.fetch(
-            """
+        # The queries are independent, so run them concurrently, each on its
+        # own pooled connection
+        type_counts, sample_data = await asyncio.gather(
+            # Check embed types, and the total embeds inserted from them
+            pool.fetchrow(
+                """
+        SELECT array_agg(embed_type::text) AS embed_types, array_agg(n) AS counts
+        FROM (
+            SELECT embed_type, COUNT(*) AS n
+            FROM k3l_cast_embeds
+            GROUP BY embed_type
+            ORDER BY embed_type
+        ) AS s
+        """
+            ),
+            # Show sample data
+            pool.fetch(
+                """
         SELECT cast_hash, embed_type, url, quoted_cast_fid 
         FROM k3l_cast_embeds 
         ORDER BY cast_hash, embed_index 
         LIMIT 5
         """
+            ),
         )
 
+        embed_types = type_counts["embed_types"] or []
+        counts = type_counts["counts"] or []
+        print(f"✓ Total embeds in target table: {sum(counts)}")
+        for embed_type, count in zip(embed_types, counts):
+            print(f"  {embed_type}: {count}")
+
         print("\n  Sample normalized data:")
         for row in sample_data:
             cast_hash_hex = row["cast_hash"].hex() if row["cast_hash"] else None
             url_or_fid = row["url"] or f"fid:{row['quoted_cast_fid']}"
             print(f"    {cast_hash_hex[:8]}... | {row['embed_type']} | {url_or_fid}")
-
-        await conn.close()
         return True
 
     except Exception as e:
@@ -123,14 +146,13 @@ async def verify_results(local_connection):
         return False
 
 
-async def main():
-    local_connection = "postgresql:///"
-
+async def run_tests(pool):
+    """Set up test data, sync it and verify the results."""
     print("Testing async embed synchronization...")
 
     # Setup test data
     print("\n1. Setting up test data...")
-    if not await setup_test_data(local_connection):
+    if not await setup_test_data(pool):
         return 1
 
     # Test synchronization
@@ -141,13 +163,8 @@ async def main():
             hour=0, minute=0, second=0, microsecond=0
         )
 
-        # Connect to databases
-        import asyncpg
-
-        source_conn = await asyncpg.connect(local_connection)
-        target_conn = await asyncpg.connect(local_connection)
-
-        try:
+        # Source and target are the same database here
+        async with pool.acquire() as source_conn, pool.acquire() as target_conn:
             result = await sync_embeds_async(
                 source_conn=source_conn,
                 target_conn=target_conn,
@@ -155,9 +172,6 @@ async def main():
                 source_schema="test_neynar",
                 target_schema="public",
             )
-        finally:
-            await source_conn.close()
-            await target_conn.close()
 
         print(f"✓ Synchronization completed!")
         print(f"  Casts processed: {result.casts_processed}")
@@ -177,15 +191,28 @@ async def main():
 
     # Verify results
     print("\n3. Verifying results...")
-    if not await verify_results(local_connection):
+    if not await verify_results(pool):
         return 1
 
     print("\n✓ All async sync tests passed!")
     return 0
 
 
+async def main():
+    local_connection = "postgresql:///"
+
+    # One pool for every step, so connections are set up once per run
+    pool = await asyncpg.create_pool(local_connection, min_size=2, max_size=4)
+    try:
+        return await run_tests(pool)
+    finally:
+        await pool.close()
+
+
 def run_main():
     """Synchronous wrapper for the async main function."""
+    # Use uvloop when available (pip install "k3l-fcgraph-embeds[fast]")
+    install_uvloop()
     return asyncio.run(main())
 
 
@@ -11,6 +11,8 @@ from k3l.fcgraph.embeds.types import (
     Embed,
     Embeds,
     _parse_hash,
+    _repair_json,
+    parse_embed_records,
     parse_embeds_from_string,
 )
 
@@ -30,6 +32,13 @@ class TestParseHash:
         expected = bytes.fromhex("d2b1ddc6c88e865a33cb1a565e0058d757042974")
         assert _parse_hash(hash_str) == expected
 
+    def test_parse_hash_repeated_string_is_cached(self):
+        """Test that repeated hash strings return the same cached bytes."""
+        first = _parse_hash("0x" + "ab" * 20)
+        second = _parse_hash("".join(["0x", "ab" * 20]))
+        assert first == bytes.fromhex("ab" * 20)
+        assert second is first
+
     def test_parse_hash_base64(self):
         """Test parsing base64 format."""
         hash_bytes = bytes.fromhex("d2b1ddc6c88e865a33cb1a565e0058d757042974")
@@ -41,6 +50,19 @@ class TestParseHash:
         hash_bytes = bytes.fromhex("d2b1ddc6c88e865a33cb1a565e0058d757042974")
         assert _parse_hash(hash_bytes) == hash_bytes
 
+    def test_parse_hash_hex_bytes_input(self):
+        """Test parsing hex text given as ASCII bytes."""
+        expected = bytes.fromhex("d2b1ddc6c88e865a33cb1a565e0058d757042974")
+        assert _parse_hash(b"d2b1ddc6c88e865a33cb1a565e0058d757042974") == expected
+        assert _parse_hash(b"0xd2b1ddc6c88e865a33cb1a565e0058d757042974") == expected
+
+    def test_parse_hash_non_hex_bytes_input(self):
+        """Test that only hex, not base64, is decoded from ASCII bytes."""
+        b64 = b"0rHdxsiOhlozyxpWXgBY11cEKXQ="
+        for value in (b64 + b" " * 12, b64 + b"A" * 12, b"0x" + b64 + b"A" * 12):
+            with pytest.raises(ValueError, match="Hash must be exactly 20 bytes"):
+                _parse_hash(value)
+
     def test_parse_hash_wrong_length_bytes(self):
         """Test error when bytes input has wrong length."""
         wrong_length_bytes = b"short"
@@ -658,6 +680,38 @@ class TestDegenerateStringParsing:
         assert embeds[1].url is None
         assert embeds[1].cast_id.fid == 123
 
+    def test_parse_quotes_inside_strings(self):
+        """Test that quotes inside string literals survive requoting."""
+        embeds_str = "[{'url': 'https://example.com/?q=\"a\"&r=it\\'s'}]"
+        embeds = parse_embeds_from_string(embeds_str)
+
+        assert len(embeds) == 1
+        assert embeds[0].url == 'https://example.com/?q="a"&r=it\'s'
+
+    def test_parse_python_only_literals(self):
+        """Test fallback for Python literals that have no JSON equivalent."""
+        embeds_str = "[{'url': 'https://example.com/\\x41', 'castId': None}]"
+        embeds = parse_embeds_from_string(embeds_str)
+
+        assert len(embeds) == 1
+        assert embeds[0].url == "https://example.com/A"
+
+    def test_repair_json(self):
+        """Test rewriting single-quoted literals as JSON strings."""
+        assert _repair_json("[{'url': 'a'}]") == '[{"url": "a"}]'
+        assert _repair_json("[{'url': \"Hom's\"}]") == '[{"url": "Hom\'s"}]'
+        assert _repair_json("['a\"b']") == '["a\\"b"]'
+        assert (
+            _repair_json("[{'url': 'None', 'castId': None, 'x': True}]")
+            == '[{"url": "None", "castId": null, "x": true}]'
+        )
+
+    def test_repair_json_keeps_python_slash_escape(self):
+        """Test that \\/ in a single-quoted literal keeps its backslash."""
+        assert _repair_json("['http:\\/\\/x.com']") == '["http:\\\\/\\\\/x.com"]'
+        embeds = parse_embeds_from_string("[{'url': 'http:\\/\\/x.com'}]")
+        assert embeds[0].url == "http:\\/\\/x.com"
+
     def test_parse_empty_string(self):
         """Test parsing empty string returns empty list."""
         assert parse_embeds_from_string("") == []
@@ -741,6 +795,32 @@ class TestEmbedsModel:
         assert len(embeds3) == 1
         assert embeds3[0].cast_id.fid == 417907
 
+    def test_embeds_from_json_string(self):
+        """Test creating Embeds from well-formed JSON, including JSON literals."""
+        embeds = Embeds(
+            '[{"url": "https://example.com", "castId": null}, '
+            '{"castId": {"fid": 789, "hash": '
+            '"0xd2b1ddc6c88e865a33cb1a565e0058d757042974"}}]'
+        )
+
+        assert len(embeds) == 2
+        assert embeds[0].url == "https://example.com"
+        assert embeds[1].cast_id.fid == 789
+
+    def test_embeds_from_json_bytes(self):
+        """Test creating Embeds from raw JSON bytes."""
+        embeds = Embeds(b'[{"url": "https://example.com"}]')
+
+        assert len(embeds) == 1
+        assert embeds[0].url == "https://example.com"
+
+    def test_embeds_from_json_encoded_degenerate_string(self):
+        """Test creating Embeds from a JSON string wrapping a degenerate string."""
+        embeds = Embeds(json.dumps("[{'url': 'https://example.com'}]"))
+
+        assert len(embeds) == 1
+        assert embeds[0].url == "https://example.com"
+
     def test_embeds_from_empty_values(self):
         """Test creating Embeds from empty values."""
         assert len(Embeds(None)) == 0
@@ -848,3 +928,47 @@ class TestEmbedsModel:
         assert len(embeds_restored) == 2
         assert embeds_restored[0].url == "https://example.com"
         assert embeds_restored[1].cast_id.fid == 123
+
+
+class TestParseEmbedRecords:
+    """Tests for the parse_embed_records function."""
+
+    def test_records_from_json(self):
+        """Test parsing URL and cast embeds into column values."""
+        records = parse_embed_records(
+            '[{"url": "https://example.com"}, '
+            '{"castId": {"fid": 789, "hash": '
+            '"0xd2b1ddc6c88e865a33cb1a565e0058d757042974"}}]'
+        )
+
+        assert records == (
+            ("url", "https://example.com", None, None),
+            (
+                "cast_id",
+                None,
+                bytes.fromhex("d2b1ddc6c88e865a33cb1a565e0058d757042974"),
+                789,
+            ),
+        )
+
+    def test_records_from_degenerate_string(self):
+        """Test parsing single-quoted strings with snake_case field names."""
+        records = parse_embed_records(
+            "[{'cast_id': {'fid': 1, 'hash': {'data': "
+            + str(list(range(20)))
+            + ", 'type': 'Buffer'}}}]"
+        )
+
+        assert records == (("cast_id", None, bytes(range(20)), 1),)
+
+    def test_records_from_empty_values(self):
+        """Test parsing empty values."""
+        assert parse_embed_records("") == ()
+        assert parse_embed_records("[]") == ()
+
+    def test_records_invalid_embed(self):
+        """Test that records reject what the Embed model rejects."""
+        with pytest.raises(ValueError, match="Exactly one of 'url' or 'cast_id'"):
+            parse_embed_records('[{"url": null}]')
+        with pytest.raises(ValueError, match="Hash must be exactly 20 bytes"):
+            parse_embed_records('[{"castId": {"fid": 1, "hash": "0x12"}}]')